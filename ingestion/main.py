@@ -2,7 +2,7 @@
 main.py — Alpha Vantage ingestion
 
 - Reads config from .env in the repo root
-- For each symbol:
+- For each symbol (all symbols fetched concurrently):
     * Fetch TIME_SERIES_DAILY_ADJUSTED (prices)
     * Fetch fundamentals: OVERVIEW, INCOME_STATEMENT, BALANCE_SHEET, CASH_FLOW
     * Save JSON locally under _local_raw/...
@@ -11,37 +11,174 @@ main.py — Alpha Vantage ingestion
 This script is “ingest only”: store raw JSON. Parsing/flattening happens later in BigQuery.
 """
 
+import asyncio
+import concurrent.futures
+import logging
+import logging.handlers
 import os
+import queue
+import random
 import time
-import json
 import datetime
 import pathlib
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 
-import requests
+import aiohttp
+import orjson
+import zstandard as zstd
+from aiolimiter import AsyncLimiter
 from dotenv import load_dotenv
 
 # ---- Load .env from repo root (works no matter where you run from) ----
 load_dotenv(dotenv_path=pathlib.Path(__file__).parent.parent / ".env")
 
 # ---- Config from environment ----
-API_KEY = os.getenv("ALPHAVANTAGE_API_KEY", "").strip()
+# ALPHAVANTAGE_API_KEYS=key1,key2,... shards symbols across keys (rate limits
+# are per-key, so throughput scales linearly); falls back to the single
+# ALPHAVANTAGE_API_KEY.
+API_KEYS = [
+    k.strip()
+    for k in os.getenv("ALPHAVANTAGE_API_KEYS", os.getenv("ALPHAVANTAGE_API_KEY", "")).split(",")
+    if k.strip()
+]
 SYMBOLS = [s.strip().upper() for s in os.getenv("SYMBOLS", "AAPL").split(",") if s.strip()]
 LOCAL_RAW_DIR = os.getenv("LOCAL_RAW_DIR", "_local_raw").strip()
 OUTPUTSIZE = os.getenv("OUTPUTSIZE", "compact").strip().lower()  # 'compact' (~100 days) or 'full'
 
+# Path roots built once instead of per iteration. Raw-zone-relative keys are
+# PurePosixPath so the GCS object name is correct on any OS without string fixups.
+LOCAL_ROOT = pathlib.Path(LOCAL_RAW_DIR)
+PRICES_PREFIX = pathlib.PurePosixPath("prices")
+FUND_PREFIX = pathlib.PurePosixPath("fundamentals")
+GCS_PREFIX = pathlib.PurePosixPath("raw")
+
 # Optional GCS mirroring
 WRITE_TO_GCS = os.getenv("WRITE_TO_GCS", "false").strip().lower() == "true"
 GCS_BUCKET = os.getenv("GCS_BUCKET", "").replace("gs://", "").strip()
 
+def _running_in_cloud() -> bool:
+    """Detect Cloud Run / GCE, where the local disk tier is just overhead."""
+    return bool(os.getenv("K_SERVICE") or os.getenv("GCE_METADATA_HOST"))
+
+
+# Keep a local copy under LOCAL_RAW_DIR. Defaults to off on Cloud Run/GCE
+# (stream straight to GCS, no double I/O via ephemeral disk) and on
+# everywhere else; an explicit LOCAL_MIRROR env always wins.
+_local_mirror_env = os.getenv("LOCAL_MIRROR", "").strip().lower()
+LOCAL_MIRROR = (_local_mirror_env == "true") if _local_mirror_env else not _running_in_cloud()
+
+# Compress raw JSON with zstd before writing (~10x on AV's repetitive
+# payloads); set COMPRESS=none to keep plain .json for local debugging
+COMPRESS = os.getenv("COMPRESS", "zstd").strip().lower()
+CCTX = zstd.ZstdCompressor(level=3, threads=-1)
+DCTX = zstd.ZstdDecompressor()
+
+# 'files' = one JSON object per endpoint (default); 'jsonl' = batch the day's
+# fundamentals into a single newline-delimited blob per partition, which
+# avoids piles of tiny objects and loads into BigQuery as-is
+BATCH_MODE = os.getenv("BATCH_MODE", "files").strip().lower()
+
+# Pretty-printing roughly doubles output bytes and serialization CPU, and the
+# downstream consumer is BigQuery — indent only when eyeballing locally
+DUMP_OPTS = orjson.OPT_INDENT_2 if os.getenv("DEBUG_PRETTY") else 0
+
+# Re-download everything even if today's partition already has the data —
+# normally reruns skip already-ingested endpoints to save rate-limit budget
+FORCE_REFETCH = os.getenv("FORCE_REFETCH", "false").strip().lower() == "true"
+
+# ---- Logging ----
+log = logging.getLogger("av.ingest")
+
+
+def _setup_logging() -> logging.handlers.QueueListener:
+    """Route records through a queue so coroutines never block on stdout I/O."""
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    q: "queue.Queue" = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(logging.handlers.QueueHandler(q))
+    listener = logging.handlers.QueueListener(q, stream)
+    listener.start()
+    return listener
+
+
 # ---- Alpha Vantage settings ----
 BASE_URL = "https://www.alphavantage.co/query"
-REQUESTS_PER_MINUTE_SAFE = 5          # Free tier ~5/min
-SLEEP_SECONDS = int(60 / REQUESTS_PER_MINUTE_SAFE) + 1  # ~13s
+AV_RPM = int(os.getenv("AV_RPM", "5"))  # requests/minute; free tier ~5, raise for paid keys
+MAX_BACKOFF_SECONDS = 60.0              # cap on a single retry wait
 
 # Fundamentals endpoints to fetch
 FUND_FUNCS = ["OVERVIEW", "INCOME_STATEMENT", "BALANCE_SHEET", "CASH_FLOW"]
 
+# Rate limiting is per API key: each key's bucket of symbols gets its own
+# AsyncLimiter(AV_RPM, 60) (created in main), so concurrent tasks on one key
+# burst up to that key's per-minute cap without touching the others.
+
+# AV counts requests server-side, so a quick restart still sees the previous
+# run's calls. Persist the recent call timestamps (per key index) to survive
+# restarts.
+BUDGET_FILE = LOCAL_ROOT / ".av_budget.json"
+_CALL_STAMPS: Dict[str, List[float]] = {}
+
+
+def _load_budget() -> Dict[str, List[float]]:
+    """Read per-key call timestamps from the previous run, keeping the last minute."""
+    try:
+        data = orjson.loads(BUDGET_FILE.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    if isinstance(data, list):  # single-key format from before sharding
+        data = {"0": data}
+    if not isinstance(data, dict):
+        return {}
+    now = time.time()
+    return {
+        k: [t for t in v if isinstance(t, (int, float)) and now - t < 60]
+        for k, v in data.items()
+        if isinstance(v, list)
+    }
+
+
+def _record_call(api_key: str) -> None:
+    """Remember a successful call so restarts respect AV's rolling window."""
+    stamps = _CALL_STAMPS.setdefault(str(API_KEYS.index(api_key)), [])
+    stamps.append(time.time())
+    del stamps[:-AV_RPM]
+    try:
+        BUDGET_FILE.parent.mkdir(parents=True, exist_ok=True)
+        BUDGET_FILE.write_bytes(orjson.dumps(_CALL_STAMPS))
+    except OSError:
+        pass  # budget tracking is best-effort; never fail the fetch over it
+
+
+async def _respect_previous_run() -> None:
+    """Sleep just long enough to get back under AV_RPM after a fast restart."""
+    budget = _load_budget()
+    for k, stamps in budget.items():
+        _CALL_STAMPS.setdefault(k, []).extend(stamps)
+    # Wait out the *newest* stamp: the fresh limiter will allow a full
+    # AV_RPM burst immediately, so every prior-run call must have left the
+    # server's 60s window first or the burst lands on top of them
+    waits = [60 - (time.time() - max(v)) for v in budget.values() if len(v) >= AV_RPM]
+    wait = max(waits, default=0.0)
+    if wait > 0:
+        log.info("Resuming under rate limit: waiting %.0fs for the previous run's budget to clear …", wait)
+        await asyncio.sleep(wait)
+
+
+# Cap on sockets in flight at once — separate from requests/minute. Without
+# this, a big symbol list can open enough connections to get reset by AV.
+AV_CONCURRENCY = int(os.getenv("AV_CONCURRENCY", "8"))
+SEM = asyncio.Semaphore(AV_CONCURRENCY)
+
+# Writer tasks draining the fetch queue (persistence side of the pipeline)
+N_WRITERS = int(os.getenv("N_WRITERS", "4"))
+
+# GCS uploads run on worker threads so blob round-trips overlap with each
+# other and with AV fetches instead of serializing inside the symbol loop
+UPLOADER = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="gcs-upload")
+
 # ---- Optional: Google Cloud Storage client (lazy) ----
 _storage_client = None
 def _get_storage_client():
@@ -57,12 +194,21 @@ def _get_storage_client():
 # ---------------------------
 # HTTP helpers
 # ---------------------------
-def _get(params: Dict[str, Any]) -> Dict[str, Any]:
+async def _get(
+    session: aiohttp.ClientSession,
+    limiter: AsyncLimiter,
+    api_key: str,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
     """Perform a GET to Alpha Vantage with basic error handling."""
-    params = {**params, "apikey": API_KEY}
-    r = requests.get(BASE_URL, params=params, timeout=30)
-    r.raise_for_status()
-    data = r.json()
+    params = {**params, "apikey": api_key}
+    async with SEM, limiter:
+        async with session.get(BASE_URL, params=params, timeout=aiohttp.ClientTimeout(total=30)) as r:
+            r.raise_for_status()
+            # orjson parses the raw bytes in one C call — the full-outputsize
+            # payloads are multi-MB, so this is a real CPU saving vs stdlib json
+            data = orjson.loads(await r.read())
+        _record_call(api_key)
 
     # Handle AV's JSON-level signals
     if isinstance(data, dict):
@@ -74,109 +220,389 @@ def _get(params: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
-def _with_retry(fn, *args, retries: int = 1, wait: int = SLEEP_SECONDS):
-    """Minimal retry wrapper for rate limit hiccups."""
+def _is_retryable(e: Exception) -> bool:
+    """Decide whether an error is transient (rate limit, 5xx, network)."""
+    if isinstance(e, asyncio.TimeoutError):
+        return True  # request exceeded ClientTimeout — try again
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status == 429 or e.status >= 500
+    if isinstance(e, aiohttp.ClientError):
+        return True  # connection resets, DNS blips
+    msg = str(e)
+    return "Rate limited" in msg or "Please consider" in msg
+
+
+def _retry_after_hint(e: Exception) -> float:
+    """Pull a server-suggested cooldown from a Retry-After header, if any."""
+    headers = getattr(e, "headers", None)
+    if headers:
+        try:
+            return float(headers.get("Retry-After", 0))
+        except (TypeError, ValueError):
+            pass
+    return 0.0
+
+
+async def _with_retry(coro_fn, *args, retries: int = 5):
+    """Retry with exponential backoff + jitter, honoring Retry-After when present."""
     for attempt in range(retries + 1):
         try:
-            return fn(*args)
-        except RuntimeError as e:
-            msg = str(e)
-            is_rate = "Rate limited" in msg or "Please consider" in msg
-            if is_rate and attempt < retries:
-                print(f"   ⚠ {msg} — retrying in {wait}s (attempt {attempt+1}/{retries})")
-                time.sleep(wait)
-                continue
-            raise
+            return await coro_fn(*args)
+        except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt >= retries or not _is_retryable(e):
+                log.error("giving up after %d attempt(s): %s", attempt + 1, e)
+                raise
+            backoff = min(MAX_BACKOFF_SECONDS, 2.0 ** attempt + random.random())
+            delay = max(_retry_after_hint(e), backoff)
+            log.warning("%s — retrying in %.1fs (attempt %d/%d)", e, delay, attempt + 1, retries)
+            await asyncio.sleep(delay)
+
+
+# A compact response covers ~100 trading days; as long as the newest stored
+# bar is younger than this, compact fills the gap and 'full' (~20 years,
+# ~600 KB per symbol) is wasted bytes
+PRICE_HISTORY_MAX_GAP_DAYS = 90
+
+
+def _latest_price_date(sym: str) -> Optional[datetime.date]:
+    """Newest bar date in the most recent locally stored daily series, if any."""
+    root = LOCAL_ROOT / "prices" / sym
+    if not root.is_dir():
+        return None
+    # Partitions are YYYY/MM/DD, so lexicographic order == chronological order
+    candidates = sorted(p for p in root.glob("*/*/*/daily_adjusted.json*") if p.suffix != ".tmp")
+    if not candidates:
+        return None
+    raw = candidates[-1].read_bytes()
+    if candidates[-1].suffix == ".zst":
+        raw = DCTX.decompress(raw)
+    try:
+        series = orjson.loads(raw).get("Time Series (Daily)", {})
+        return datetime.date.fromisoformat(max(series))
+    except (orjson.JSONDecodeError, TypeError, ValueError):
+        return None
+
+
+def _resolve_outputsize(symbol: str) -> str:
+    """Downgrade a requested 'full' to 'compact' when local history is fresh."""
+    if OUTPUTSIZE != "full" or FORCE_REFETCH:
+        return OUTPUTSIZE
+    last = _latest_price_date(symbol)
+    if last is None:
+        return "full"  # no history yet — first backfill
+    gap = (datetime.datetime.now(datetime.timezone.utc).date() - last).days
+    if gap <= PRICE_HISTORY_MAX_GAP_DAYS:
+        log.info("%s history current through %s — fetching compact instead of full", symbol, last)
+        return "compact"
+    return "full"
 
 
 # ---------------------------
 # Fetchers
 # ---------------------------
-def fetch_daily_adjusted(symbol: str) -> Dict[str, Any]:
+async def fetch_daily_adjusted(
+    session: aiohttp.ClientSession, limiter: AsyncLimiter, api_key: str, symbol: str
+) -> Dict[str, Any]:
     """Fetch TIME_SERIES_DAILY_ADJUSTED for a symbol."""
     params = {
         "function": "TIME_SERIES_DAILY_ADJUSTED",
         "symbol": symbol,
-        "outputsize": OUTPUTSIZE,  # 'compact' or 'full'
+        "outputsize": _resolve_outputsize(symbol),  # 'compact' or 'full'
     }
-    return _get(params)
+    return await _get(session, limiter, api_key, params)
 
 
-def fetch_fundamental(fn: str, symbol: str) -> Dict[str, Any]:
+async def fetch_fundamental(
+    session: aiohttp.ClientSession, limiter: AsyncLimiter, api_key: str, fn: str, symbol: str
+) -> Dict[str, Any]:
     """Fetch a single fundamentals endpoint (e.g., OVERVIEW, INCOME_STATEMENT)."""
     params = {"function": fn, "symbol": symbol}
-    return _get(params)
+    return await _get(session, limiter, api_key, params)
 
 
 # ---------------------------
 # IO helpers
 # ---------------------------
-def save_json(payload: Dict[str, Any], path: pathlib.Path) -> None:
-    """Save JSON to disk, creating parent dirs as needed."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
-
-
-def upload_to_gcs(local_path: pathlib.Path, gcs_key: pathlib.Path) -> None:
-    """Upload a local file to GCS at the given key (if WRITE_TO_GCS enabled)."""
-    if not WRITE_TO_GCS or not GCS_BUCKET:
-        return
+def _upload_blob(buf: bytes, key: str) -> None:
+    """Upload bytes to GCS (runs on an UPLOADER worker thread)."""
     client = _get_storage_client()
     bucket = client.bucket(GCS_BUCKET)
-    blob = bucket.blob(str(gcs_key).replace("\\", "/"))  # ensure POSIX-style path
-    blob.upload_from_filename(str(local_path))
-    print(f"   ↗ uploaded to gs://{GCS_BUCKET}/{blob.name}")
+    blob = bucket.blob(key)
+    if key.endswith(".zst"):
+        blob.content_encoding = "zstd"
+    if len(buf) > 8 << 20:
+        # Big payloads: resumable upload with a 16 MiB chunk buffer. Leaving
+        # chunk_size unset for the common tiny blobs keeps upload_from_string
+        # on the single-request path — one POST, no per-blob chunk allocation.
+        blob.chunk_size = 16 << 20
+    # Upload the bytes already in hand — no dump-to-disk-then-reread round-trip
+    blob.upload_from_string(buf, content_type="application/json")
+    log.info("uploaded to gs://%s/%s", GCS_BUCKET, blob.name)
+
+
+def persist(payload: Dict[str, Any], rel_path: pathlib.PurePosixPath) -> Optional[concurrent.futures.Future]:
+    """Serialize a payload once, then write it locally and/or upload to GCS.
+
+    rel_path is relative to the raw zone root, e.g.
+    prices/<SYM>/YYYY/MM/DD/daily_adjusted.json — it lands under
+    LOCAL_RAW_DIR on disk and under raw/ in the bucket. Returns the
+    pending upload future (if any) so callers can await completion.
+    """
+    return persist_bytes(orjson.dumps(payload, option=DUMP_OPTS), rel_path)
+
+
+def persist_bytes(buf: bytes, rel_path: pathlib.PurePosixPath) -> Optional[concurrent.futures.Future]:
+    """Write already-serialized bytes locally and/or upload them to GCS."""
+    if COMPRESS == "zstd":
+        buf = CCTX.compress(buf)
+        rel_path = rel_path.with_suffix(rel_path.suffix + ".zst")
+
+    if LOCAL_MIRROR:
+        local_path = LOCAL_ROOT / rel_path
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-fsync-rename: a crash or power loss mid-write can never leave
+        # a truncated file for the rerun skip check or a BQ load to ingest —
+        # the data must be durable before the name points at it
+        tmp = local_path.with_suffix(local_path.suffix + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(buf)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, local_path)
+        log.info("saved to %s", local_path)
+
+    if WRITE_TO_GCS and GCS_BUCKET:
+        return UPLOADER.submit(_upload_blob, buf, str(GCS_PREFIX / rel_path))
+    return None
+
+
+def _already_ingested(rel_path: pathlib.PurePosixPath) -> bool:
+    """True if today's partition already holds a non-empty local copy.
+
+    Reruns on the same day then skip the fetch entirely, preserving the
+    rate-limit budget for symbols that still need data.
+    """
+    if FORCE_REFETCH or not LOCAL_MIRROR:
+        return False
+    if COMPRESS == "zstd":
+        rel_path = rel_path.with_suffix(rel_path.suffix + ".zst")
+    path = LOCAL_ROOT / rel_path
+    return path.exists() and path.stat().st_size > 0
+
+
+# OVERVIEW only changes when a new quarter is reported; while the cached
+# quarter is younger than this, copy it forward instead of calling AV
+OVERVIEW_MAX_QUARTER_AGE_DAYS = 100
+
+
+def _latest_cached_overview(sym: str) -> Optional[Dict[str, Any]]:
+    """Load the newest locally stored OVERVIEW payload for a symbol, if any."""
+    root = LOCAL_ROOT / "fundamentals" / sym
+    if not root.is_dir():
+        return None
+    # Partitions are YYYY/MM/DD, so lexicographic order == chronological order
+    candidates = sorted(p for p in root.glob("*/*/*/overview.json*") if p.suffix != ".tmp")
+    if not candidates:
+        return None
+    raw = candidates[-1].read_bytes()
+    if candidates[-1].suffix == ".zst":
+        raw = DCTX.decompress(raw)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _overview_still_current(data: Dict[str, Any]) -> bool:
+    """True while the cached LatestQuarter is too recent for a new report."""
+    try:
+        quarter = datetime.date.fromisoformat(str(data["LatestQuarter"]))
+    except (KeyError, ValueError):
+        return False
+    age = (datetime.datetime.now(datetime.timezone.utc).date() - quarter).days
+    return age < OVERVIEW_MAX_QUARTER_AGE_DAYS
+
+
+# ---------------------------
+# Per-symbol pipeline
+# ---------------------------
+async def handle_symbol(
+    session: aiohttp.ClientSession,
+    limiter: AsyncLimiter,
+    api_key: str,
+    q: asyncio.Queue,
+    fund_rows: List[Dict[str, Any]],
+    failures: List[str],
+    sym: str,
+    day_path: str,
+) -> None:
+    """Fetch prices + all fundamentals for one symbol and queue payloads for writing.
+
+    Each fetch failure is recorded in `failures` rather than raised, so one
+    bad ticker never cancels sibling fetches or tears down the writers with
+    payloads still queued — everything that was fetched gets persisted.
+    """
+    rel_prices = PRICES_PREFIX / sym / day_path / "daily_adjusted.json"
+    if _already_ingested(rel_prices):
+        log.info("%s prices already ingested today — skipping", sym)
+    else:
+        log.info("fetching %s prices …", sym)
+        try:
+            data_prices = await _with_retry(fetch_daily_adjusted, session, limiter, api_key, sym)
+            await q.put((data_prices, rel_prices))
+        except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.error("%s prices failed: %s", sym, e)
+            failures.append(f"{sym}/prices")
+
+    # Fundamentals: the endpoints are independent, so issue them together
+    async def one_fundamental(fn: str) -> None:
+        rel_f = FUND_PREFIX / sym / day_path / f"{fn.lower()}.json"
+        if BATCH_MODE != "jsonl" and _already_ingested(rel_f):
+            log.info("%s for %s already ingested today — skipping", fn, sym)
+            return
+        if fn == "OVERVIEW" and not FORCE_REFETCH:
+            cached = _latest_cached_overview(sym)
+            if cached is not None and _overview_still_current(cached):
+                # Quarter hasn't rolled over: copy the payload forward into
+                # today's partition without spending an API call on it
+                log.info("OVERVIEW for %s unchanged since %s — reusing cache", sym, cached.get("LatestQuarter"))
+                if BATCH_MODE == "jsonl":
+                    fund_rows.append({"symbol": sym, "function": fn, "payload": cached})
+                else:
+                    await q.put((cached, rel_f))
+                return
+        log.info("fundamentals: %s for %s", fn, sym)
+        try:
+            data_f = await _with_retry(fetch_fundamental, session, limiter, api_key, fn, sym)
+        except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.error("%s %s failed: %s", sym, fn, e)
+            failures.append(f"{sym}/{fn}")
+            return
+        if BATCH_MODE == "jsonl":
+            # Buffer for one combined blob per day partition
+            fund_rows.append({"symbol": sym, "function": fn, "payload": data_f})
+        else:
+            await q.put((data_f, rel_f))
+
+    await asyncio.gather(*(one_fundamental(fn) for fn in FUND_FUNCS))
+
+
+async def run_bucket(
+    api_key: str,
+    limiter: AsyncLimiter,
+    q: asyncio.Queue,
+    fund_rows: List[Dict[str, Any]],
+    failures: List[str],
+    syms: List[str],
+    day_path: str,
+) -> None:
+    """Ingest one shard of symbols with its own key, limiter, and session.
+
+    Sessions are per key so keepalive pools (and AV's per-key throttling)
+    never cross shards.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=AV_CONCURRENCY,
+        ttl_dns_cache=300,
+        # Keep idle connections alive longer than the gaps the rate limiter
+        # introduces, so TLS handshakes amortize across the whole run
+        keepalive_timeout=60,
+    )
+    # AV JSON compresses ~5-8x; ask for gzip/br explicitly and let aiohttp
+    # decompress transparently — big bandwidth saving on outputsize=full
+    headers = {"Accept-Encoding": "gzip, br"}
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        await asyncio.gather(
+            *(handle_symbol(session, limiter, api_key, q, fund_rows, failures, sym, day_path) for sym in syms)
+        )
+
+
+async def writer(q: asyncio.Queue, failures: List[str]) -> None:
+    """Consume fetched payloads off the queue and persist them (disk + GCS).
+
+    A failed write or upload is logged and recorded in `failures` so the
+    queue keeps draining but main() still exits non-zero — a green run
+    guarantees every payload actually landed.
+    """
+    while True:
+        payload, rel_path = await q.get()
+        try:
+            fut = persist(payload, rel_path)
+            if fut is not None:
+                await asyncio.wrap_future(fut)
+        except Exception as e:
+            log.error("failed to persist %s: %s", rel_path, e)
+            failures.append(f"persist:{rel_path}")
+        finally:
+            q.task_done()
 
 
 # ---------------------------
 # Main
 # ---------------------------
-def main():
-    if not API_KEY:
-        raise RuntimeError("Missing ALPHAVANTAGE_API_KEY (set it in .env).")
+async def main():
+    if not API_KEYS:
+        raise RuntimeError("Missing ALPHAVANTAGE_API_KEY / ALPHAVANTAGE_API_KEYS (set one in .env).")
+
+    await _respect_previous_run()
 
     # Use timezone-aware UTC; partition by YYYY/MM/DD
     today = datetime.datetime.now(datetime.timezone.utc)
     day_path = today.strftime("%Y/%m/%d")
 
     symbols_total = len(SYMBOLS)
-    print(f"Starting ingestion for {symbols_total} symbol(s). Outputsize={OUTPUTSIZE}, GCS={'on' if WRITE_TO_GCS else 'off'}")
-
-    for i, sym in enumerate(SYMBOLS, start=1):
-        print(f"[{i}/{symbols_total}] Fetching {sym} prices …")
-        data_prices = _with_retry(fetch_daily_adjusted, sym, retries=1)
-        out_path_prices = pathlib.Path(LOCAL_RAW_DIR) / "prices" / sym / day_path / "daily_adjusted.json"
-        save_json(data_prices, out_path_prices)
-        print(f"   → saved to {out_path_prices}")
-
-        # Mirror to GCS: raw/prices/<SYM>/YYYY/MM/DD/daily_adjusted.json
-        rel_prices = out_path_prices.relative_to(pathlib.Path(LOCAL_RAW_DIR))
-        upload_to_gcs(out_path_prices, pathlib.Path("raw") / rel_prices)
-
-        # Fundamentals
-        for fn in FUND_FUNCS:
-            print(f"   • fundamentals: {fn} for {sym}")
-            data_f = _with_retry(fetch_fundamental, fn, sym, retries=1)
-            out_f = pathlib.Path(LOCAL_RAW_DIR) / "fundamentals" / sym / day_path / f"{fn.lower()}.json"
-            save_json(data_f, out_f)
-            print(f"     → saved to {out_f}")
-
-            # Mirror to GCS: raw/fundamentals/<SYM>/YYYY/MM/DD/<fn>.json
-            rel_f = out_f.relative_to(pathlib.Path(LOCAL_RAW_DIR))
-            upload_to_gcs(out_f, pathlib.Path("raw") / rel_f)
-
-            # Respect per-request pacing
-            print(f"     sleeping {SLEEP_SECONDS}s (rate limit)…")
-            time.sleep(SLEEP_SECONDS)
+    log.info(
+        "Starting ingestion for %d symbol(s) across %d key(s). Outputsize=%s, GCS=%s",
+        symbols_total, len(API_KEYS), OUTPUTSIZE, "on" if WRITE_TO_GCS else "off",
+    )
+
+    # Producer/consumer: fetchers push payloads onto a bounded queue, writer
+    # tasks drain it, so disk/GCS latency hides under the AV pacing window
+    q: asyncio.Queue = asyncio.Queue(maxsize=64)
+    fund_rows: List[Dict[str, Any]] = []
+    failures: List[str] = []
+    writers = [asyncio.create_task(writer(q, failures)) for _ in range(N_WRITERS)]
+
+    # Round-robin symbols across keys; each shard gets its own limiter so
+    # throughput scales linearly with the number of keys
+    limiters = [AsyncLimiter(max_rate=AV_RPM, time_period=60) for _ in API_KEYS]
+    buckets = [SYMBOLS[i::len(API_KEYS)] for i in range(len(API_KEYS))]
+    await asyncio.gather(
+        *(
+            run_bucket(key, lim, q, fund_rows, failures, syms, day_path)
+            for key, lim, syms in zip(API_KEYS, limiters, buckets)
+            if syms
+        )
+    )
+    await q.join()  # all queued payloads persisted
+    for w in writers:
+        w.cancel()
+
+    if fund_rows:
+        # One JSONL blob for the whole day's fundamentals: N symbols × 4
+        # endpoints as rows instead of that many tiny objects
+        buf = b"".join(orjson.dumps(row) + b"\n" for row in fund_rows)
+        rel_jsonl = pathlib.PurePosixPath(day_path) / "fundamentals.jsonl"
+        try:
+            fut = persist_bytes(buf, rel_jsonl)
+            if fut is not None:
+                await asyncio.wrap_future(fut)
+        except Exception as e:
+            log.error("failed to persist %s: %s", rel_jsonl, e)
+            failures.append(f"persist:{rel_jsonl}")
 
-        # Extra sleep between symbols to stay under AV free-tier limits
-        if i < symbols_total:
-            print(f"   sleeping {SLEEP_SECONDS}s before next symbol …")
-            time.sleep(SLEEP_SECONDS)
+    if failures:
+        # Everything fetchable was persisted; now surface what wasn't so a
+        # green exit code still guarantees a complete day
+        raise RuntimeError(f"{len(failures)} operation(s) failed: {', '.join(failures)}")
 
-    print("Ingestion complete.")
+    log.info("Ingestion complete.")
 
 
 if __name__ == "__main__":
-    main()
+    _listener = _setup_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        _listener.stop()